@@ -0,0 +1,40 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Compiled natural sort key for main.py (optional).
+
+Build in place with:  cythonize -i _natsort.pyx
+main.py falls back to its pure Python natural_sort_key when this module is not built.
+The keys are identical to the Python version: ('text', number, 'text', ...).
+"""
+from cpython.unicode cimport Py_UNICODE_ISDECIMAL, Py_UNICODE_TODECIMAL
+
+cdef enum:
+    MAX_FAST_DIGITS = 18 # Digit runs up to this length always fit in a C long long
+
+def natural_sort_key(str name):
+    """Generate a key for natural sort (e.g., 'page1', 'page2', 'page10')."""
+    name = name.casefold() # Once for the whole name, like the Python version
+    cdef Py_ssize_t n = len(name)
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t start, j
+    cdef long long value
+    parts = []
+    while True:
+        # Text run (possibly empty)
+        start = i
+        while i < n and not Py_UNICODE_ISDECIMAL(name[i]):
+            i += 1
+        parts.append(name[start:i])
+        if i >= n:
+            break
+        # Digit run: same characters as the regex \d (Unicode decimal digits)
+        start = i
+        while i < n and Py_UNICODE_ISDECIMAL(name[i]):
+            i += 1
+        if i - start <= MAX_FAST_DIGITS:
+            value = 0
+            for j in range(start, i):
+                value = value * 10 + Py_UNICODE_TODECIMAL(name[j])
+            parts.append(value)
+        else:
+            parts.append(int(name[start:i])) # Arbitrary precision for very long numbers
+    return tuple(parts)
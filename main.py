@@ -1,77 +1,449 @@
-import fitz  # PyMuPDF
 import os
+# Parallelism is managed here at the Python level (worker processes/threads).
+# Keep OpenMP/BLAS-backed libraries single-threaded so nested thread pools
+# don't oversubscribe the CPU. Must be set before fitz/PIL are imported.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
+import fitz  # PyMuPDF
 import sys
 import re  # Import for natural sort
+import argparse
+import atexit
+import logging
+import logging.handlers
+import multiprocessing
+import queue
+import struct
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from PIL import Image
 import io
 
+# Optional: libjpeg-turbo bindings for fast JPEG output (pip install PyTurboJPEG)
+try:
+    import numpy as np
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJPF_GRAY, TJSAMP_GRAY
+except ImportError:
+    TurboJPEG = None
+
+# Console output goes through logging so that per-page lines are queued and
+# written by a single background thread (see _start_logging).
+log = logging.getLogger("pdf_png_converter")
+page_log = log.getChild("pages") # Per-page progress lines; silenced by --quiet
+
+def _start_logging(quiet=False):
+    """Send log records to stdout via a queue drained by a listener thread."""
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    log.addHandler(logging.handlers.QueueHandler(log_queue))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    if quiet:
+        page_log.setLevel(logging.WARNING)
+    listener.start()
+    atexit.register(listener.stop) # Flush queued lines on exit, including sys.exit()
+    return listener
+
 # --- Helper function for natural sort ---
-def natural_sort_key(s):
-    """Generate a key for natural sort (e.g., 'page1', 'page2', 'page10')."""
-    # Split the string into tuples of non-digit and digit parts
+_NAT_RE = re.compile(r'(\d+)') # Compiled once; used for every sort key
+
+def natural_sort_key(name):
+    """Generate a key for natural sort (e.g., 'page1', 'page2', 'page10').
+
+    name is a bare file name; callers pass the name they already have instead
+    of a full path.
+    """
+    # Split the filename into alternating non-digit and digit parts
     # Example: "image10.png" -> ('image', 10, '.png')
-    # This ensures that the numeric parts are compared correctly
-    return [int(text) if text.isdigit() else text.lower()
-            for text in re.split(r'(\d+)', os.path.basename(s))] # Sort by filename part only (Changed regex to split by digit)
+    # With a capturing group, re.split always puts the digit runs at odd
+    # indices, so no per-token isdigit() check is needed.
+    # Tuples compare faster than lists, so sorted() does less work per comparison.
+    # casefold() runs once on the whole name (caseless matching, e.g. 'ß' == 'ss')
+    # instead of lower() on every text part.
+    parts = _NAT_RE.split(name.casefold())
+    return tuple(int(p) if i & 1 else p for i, p in enumerate(parts))
+
+# Use the compiled key function when _natsort.pyx has been built (see README)
+try:
+    from _natsort import natural_sort_key
+except ImportError:
+    pass
+
+# --- Process pool sizing ---
+_MAX_WINDOWS_WORKERS = 61 # ProcessPoolExecutor rejects more workers than this on Windows
+
+def _pool_size(task_count):
+    """Number of worker processes for task_count independent tasks: one per core."""
+    max_workers = min(os.cpu_count() or 1, task_count)
+    if sys.platform == "win32":
+        max_workers = min(max_workers, _MAX_WINDOWS_WORKERS)
+    return max_workers
 
-def convert_pdf_to_png(pdf_path, output_dir):
-    """Convert each page of a PDF file into a PNG image."""
+# --- Workers for parallel PDF -> PNG rendering ---
+# Each worker process renders a contiguous range of pages. Inside a worker,
+# rasterization and image encoding form a two-stage pipeline: the worker thread
+# renders pixmaps into a bounded queue while encoder threads save them.
+_ENCODE_THREADS = 2
+_PIPELINE_DEPTH = 4 # Max rendered pixmaps waiting to be encoded
+_DEFAULT_JPEG_QUALITY = 90
+_DEFAULT_DPI = 200 # PDF user space is 72 DPI; render work grows with dpi**2
+_DEFAULT_COMPRESS_LEVEL = 1 # zlib level for PNG output (0-9); 1 is fast with slightly larger files
+
+_turbojpeg = None # Per-process TurboJPEG instance (False if unavailable)
+
+def _get_turbojpeg():
+    """Return this process's TurboJPEG encoder, or None if libjpeg-turbo is unavailable."""
+    global _turbojpeg
+    if _turbojpeg is None:
+        _turbojpeg = False
+        if TurboJPEG is not None:
+            try:
+                _turbojpeg = TurboJPEG()
+            except (OSError, RuntimeError):
+                pass # Python bindings installed, but the shared library was not found
+    return _turbojpeg or None
+
+# O_BINARY matters on Windows, where os.open() defaults to text mode
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+def _write_file(path, data):
+    """Write bytes to path with one open() and (normally) one write() syscall."""
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):] # os.write may write less than asked
+    finally:
+        os.close(fd)
+
+# --- Network output detection ---
+_REMOTE_WRITE_THREADS = 8 # Concurrent file writes per worker when the output is remote
+_REMOTE_FS_TYPES = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "afs", "ceph", "glusterfs",
+                    "fuse.sshfs", "fuse.glusterfs", "fuse.rclone", "davfs"}
+
+def _is_remote_path(path):
+    """Best-effort check whether path is on a network share (UNC/mapped drive, NFS, SMB...)."""
+    path = os.path.abspath(path)
+    if os.name == "nt":
+        if path.startswith("\\\\"): # UNC path: \\server\share
+            return True
+        import ctypes
+        DRIVE_REMOTE = 4
+        return ctypes.windll.kernel32.GetDriveTypeW(os.path.splitdrive(path)[0] + "\\") == DRIVE_REMOTE
+    # Linux: find the filesystem type of the longest mount point containing path
+    path = os.path.realpath(path)
+    best_mount, best_type = "", ""
+    try:
+        with open("/proc/mounts") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount = fields[1].replace("\\040", " ") # Spaces are escaped in /proc/mounts
+                if (path == mount or path.startswith(mount.rstrip("/") + "/")) and len(mount) > len(best_mount):
+                    best_mount, best_type = mount, fields[2]
+    except OSError:
+        return False # No /proc/mounts (e.g. macOS): assume local
+    return best_type in _REMOTE_FS_TYPES
+
+def _encode_pixmap(pix, options):
+    """Encode a rendered pixmap as PNG or JPEG bytes."""
+    if options["image_format"] != "jpg":
+        # MuPDF's own PNG writer always deflates at a high level; going through
+        # Pillow lets us pick a cheaper zlib level.
+        data = pix.pil_tobytes(format="PNG", optimize=False,
+                               compress_level=options["compress_level"])
+    else:
+        tj = _get_turbojpeg()
+        if tj is not None:
+            # Hand the raw samples straight to libjpeg-turbo (SIMD DCT/Huffman)
+            arr = np.frombuffer(pix.samples_mv, np.uint8).reshape(pix.h, pix.w, pix.n)
+            if pix.n == 1:
+                data = tj.encode(arr, quality=options["quality"], pixel_format=TJPF_GRAY,
+                                 jpeg_subsample=TJSAMP_GRAY)
+            else:
+                data = tj.encode(arr, quality=options["quality"], pixel_format=TJPF_RGB)
+        else:
+            # MuPDF's built-in JPEG writer works on the pixmap directly, with no
+            # copy into a Pillow image first.
+            data = pix.tobytes("jpeg", jpg_quality=options["quality"])
+    return data
+
+class _RemoteWriter:
+    """Write files from a small thread pool so several writes to a network share are in flight.
+
+    At most _REMOTE_WRITE_THREADS encoded pages are held at once; submit() blocks
+    when that many are waiting, which keeps the encoders' backpressure intact.
+    """
+
+    def __init__(self):
+        self._pool = ThreadPoolExecutor(max_workers=_REMOTE_WRITE_THREADS)
+        self._slots = threading.BoundedSemaphore(_REMOTE_WRITE_THREADS)
+        self._futures = []
+
+    def submit(self, path, data):
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(_write_file, path, data)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def close(self):
+        """Wait for all writes and return the errors they raised."""
+        self._pool.shutdown(wait=True)
+        errors = []
+        for future in self._futures:
+            error = future.exception()
+            if error is not None:
+                errors.append(error)
+        return errors
+
+def _encode_pages(q, options, errors, writer=None):
+    """Encode and save pixmaps from the queue until the end marker (None) arrives.
+
+    With a _RemoteWriter (network output), writes are handed off to it.
+    """
+    while True:
+        item = q.get()
+        if item is None:
+            return
+        if errors:
+            continue # Keep draining so the renderer never blocks on a failed pipeline
+        pix, output_path = item
+        try:
+            data = _encode_pixmap(pix, options)
+            if writer is None:
+                _write_file(output_path, data)
+            else:
+                writer.submit(output_path, data)
+        except Exception as e:
+            errors.append(e)
+
+def _render_pages(task):
+    """Render a range of PDF pages to image files (runs in a worker process)."""
+    pdf_path, page_nums, output_paths, options = task
+    q = queue.Queue(maxsize=_PIPELINE_DEPTH)
+    errors = []
+    # Open the PDF before the encoders start: if this fails there are no threads
+    # waiting on the queue for end markers.
+    doc = fitz.open(pdf_path)
+    # On a network share each write mostly waits on the round trip, so keep
+    # several in flight instead of stalling the encoders.
+    writer = _RemoteWriter() if options["remote_output"] else None
+    try:
+        with ThreadPoolExecutor(max_workers=_ENCODE_THREADS) as encoders:
+            for _ in range(_ENCODE_THREADS):
+                encoders.submit(_encode_pages, q, options, errors, writer)
+            try:
+                # Scale from 72 DPI to the requested resolution (e.g., 288 DPI = 4x4)
+                # Higher values improve image quality but increase file size and render time
+                scale = options["dpi"] / 72.0
+                mat = fitz.Matrix(scale, scale)
+                # Pages are opaque, so never render an alpha channel; grayscale output
+                # has a third of the bytes of RGB to encode.
+                colorspace = fitz.csGRAY if options["grayscale"] else fitz.csRGB
+                for page_num, output_path in zip(page_nums, output_paths):
+                    if errors:
+                        break
+                    pix = doc.load_page(page_num).get_pixmap(matrix=mat, colorspace=colorspace, alpha=False)
+                    q.put((pix, output_path))
+            finally:
+                for _ in range(_ENCODE_THREADS):
+                    q.put(None)
+    finally:
+        doc.close()
+        if writer is not None:
+            # Always drain the writer, even when rendering failed, so no threads
+            # outlive this task in the reused worker process.
+            errors.extend(writer.close())
+    if errors:
+        raise errors[0]
+    return output_paths
+
+def convert_pdf_to_png(pdf_path, output_dir, image_format="png", compress_level=_DEFAULT_COMPRESS_LEVEL,
+                       dpi=_DEFAULT_DPI, grayscale=False, quality=_DEFAULT_JPEG_QUALITY):
+    """Convert each page of a PDF file into a PNG (or JPEG) image."""
+    options = {"image_format": image_format, "compress_level": compress_level, "dpi": dpi,
+               "grayscale": grayscale, "quality": quality}
     try:
         doc = fitz.open(pdf_path)
+        page_count = len(doc)
+        doc.close()
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
-        print(f"Converting '{os.path.basename(pdf_path)}' to PNG...")
+        options["remote_output"] = _is_remote_path(output_dir)
+        log.info(f"Converting '{os.path.basename(pdf_path)}' to {image_format.upper()}...")
+        if options["remote_output"]:
+            log.info("Output is on a network share; writing several pages concurrently.")
         pdf_base_name = os.path.splitext(os.path.basename(pdf_path))[0] # Get PDF base name
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            # Increase the matrix values to improve resolution (e.g., 4x4 = 288 DPI)
-            # Higher values improve image quality but increase file size
-            mat = fitz.Matrix(4, 4)
-            pix = page.get_pixmap(matrix=mat)
-            # Use PDF base name for output filename
-            output_filename = f"{pdf_base_name}_{page_num + 1}.png"
-            output_path = os.path.join(output_dir, output_filename)
-            pix.save(output_path)
-            print(f"  - Saved: {output_filename}")
-        doc.close()
-        print(f"Conversion to PNG completed. Output directory: {output_dir}")
+        # Use PDF base name for output filenames
+        output_paths = [os.path.join(output_dir, f"{pdf_base_name}_{page_num + 1}.{image_format}")
+                        for page_num in range(page_count)]
+        if page_count:
+            # Pages are independent, so render them in parallel (one process per core).
+            max_workers = _pool_size(page_count)
+            # About two page ranges per worker: long enough for the render/encode
+            # pipeline to overlap, short enough to balance uneven pages.
+            pages_per_task = -(-page_count // (max_workers * 2))
+            worklist = [(pdf_path, range(start, min(start + pages_per_task, page_count)),
+                         output_paths[start:start + pages_per_task], options)
+                        for start in range(0, page_count, pages_per_task)]
+            with ProcessPoolExecutor(max_workers=max_workers) as ex:
+                for saved_paths in ex.map(_render_pages, worklist):
+                    for output_path in saved_paths:
+                        page_log.info(f"  - Saved: {os.path.basename(output_path)}")
+        log.info(f"Conversion to {image_format.upper()} completed. Output directory: {output_dir}")
         return True
     except Exception as e:
-        print(f"Error (PDF -> PNG): {e}")
+        log.error(f"Error (PDF -> PNG): {e}")
         return False
 
+# --- Helpers for PNG -> PDF conversion ---
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_DEFAULT_IMAGE_DPI = 96 # MuPDF's default when an image has no resolution info
+
+def _page_dpi(dpi):
+    """Resolution used for an image's page size; like MuPDF, 72 if dpi is implausible."""
+    dpi = round(dpi)
+    return dpi if 72 <= dpi <= 4800 else 72
+
+def _png_info(data):
+    """Read pixel size, resolution and transparency from the PNG header chunks.
+
+    Returns (width, height, dpi, has_alpha), or None if data is not a PNG.
+    Only the chunks before the first IDAT are parsed, so no pixels are decoded.
+    """
+    if data[:8] != _PNG_SIGNATURE:
+        return None
+    if len(data) < 33 or data[12:16] != b"IHDR": # Signature + complete IHDR chunk
+        raise ValueError("truncated or invalid PNG header")
+    width, height = struct.unpack(">II", data[16:24])
+    has_alpha = data[25] in (4, 6) # Gray + alpha, RGB + alpha
+    dpi = _DEFAULT_IMAGE_DPI
+    pos = 8
+    while pos + 8 <= len(data):
+        length, chunk_type = struct.unpack(">I4s", data[pos:pos + 8])
+        if chunk_type == b"IDAT" or pos + length + 12 > len(data):
+            break # Pixel data reached, or a truncated chunk (MuPDF reports that)
+        if chunk_type == b"pHYs" and data[pos + 16] == 1: # Unit: pixels per metre
+            # Like MuPDF, use the horizontal resolution
+            dpi = _page_dpi(struct.unpack(">I", data[pos + 8:pos + 12])[0] * 0.0254)
+        elif chunk_type == b"tRNS": # Palette or color-key transparency
+            has_alpha = True
+        pos += length + 12 # Length, type, data, CRC
+    return width, height, dpi, has_alpha
+
+def _add_image_page(doc, rect, **image_args):
+    """Append a page of size rect showing an image; no page is left behind if embedding fails."""
+    pdf_page = doc.new_page(width=rect.width, height=rect.height)
+    try:
+        pdf_page.insert_image(rect, **image_args)
+    except Exception:
+        doc.delete_page(-1)
+        raise
+
+def _insert_png_page(doc, img_path):
+    """Append a page to doc showing the image at img_path at its own size."""
+    # A plain read() is already a single copy (it sizes the buffer from fstat).
+    # mmap would not save anything: insert_image() only accepts bytes, bytearray
+    # or BytesIO streams and copies them into a MuPDF buffer regardless.
+    with open(img_path, "rb") as f:
+        data = f.read()
+    info = _png_info(data)
+    if info is not None:
+        width, height, dpi, has_alpha = info
+        # Page size in points at the image's own resolution
+        rect = fitz.Rect(0, 0, width * 72 / dpi, height * 72 / dpi)
+        # Passing the bytes with known size and transparency lets MuPDF
+        # embed the PNG without an extra decode pass.
+        _add_image_page(doc, rect, stream=data, width=width, height=height,
+                        alpha=-1 if has_alpha else 0)
+    else:
+        # Not a real PNG (e.g. a renamed JPEG). Pillow only parses the header
+        # here, so the pixels are decoded once, by MuPDF when embedding.
+        try:
+            with warnings.catch_warnings():
+                # Only the header is read, so large scans are not a decompression bomb
+                warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+                with Image.open(io.BytesIO(data)) as img:
+                    width, height = img.size
+                    dpi = img.info.get("dpi", (0, 0))[0]
+            dpi = _page_dpi(dpi) if dpi > 1 else _DEFAULT_IMAGE_DPI # (1, 1) means "no unit"
+            rect = fitz.Rect(0, 0, width * 72 / dpi, height * 72 / dpi)
+        except Exception:
+            # Pillow can't read it (or refuses to, e.g. DecompressionBombError), but
+            # MuPDF may still know the format (e.g. PAM): size the page from MuPDF.
+            img = fitz.open(img_path) # Raises if MuPDF can't read it either
+            rect = img[0].rect # Get the size of the image
+            img.close()
+        # Create a page with the image size and insert the image onto it
+        _add_image_page(doc, rect, stream=data)
+
+def _build_pdf_part(image_paths):
+    """Build an in-memory PDF from a run of images (runs in a worker process).
+
+    Returns (pdf_bytes, errors): pdf_bytes is None if no page was created, and
+    errors holds one message (or None on success) per image.
+    """
+    doc = fitz.open()
+    errors = []
+    for img_path in image_paths:
+        try:
+            _insert_png_page(doc, img_path)
+            errors.append(None)
+        except Exception as page_e:
+            errors.append(str(page_e))
+    pdf_bytes = doc.tobytes() if len(doc) > 0 else None
+    doc.close()
+    return pdf_bytes, errors
+
 def convert_png_to_pdf(image_paths, output_pdf_path):
     """Convert multiple PNG images into a single PDF file (in the specified order)."""
     try:
-        print(f"Converting PNG images to PDF (page order determined)...")
+        log.info(f"Converting PNG images to PDF (page order determined)...")
         doc = fitz.open() # Create a new empty PDF
-        for i, img_path in enumerate(image_paths):
-            print(f"  - Page {i+1}: '{os.path.basename(img_path)}'")
-            try:
-                img = fitz.open(img_path) # Open the image file
-                rect = img[0].rect # Get the size of the image
-                # Create a page with the image size
-                pdf_page = doc.new_page(width=rect.width, height=rect.height)
-                pdf_page.insert_image(rect, filename=img_path) # Insert the image onto the page
-                img.close()
-            except Exception as page_e:
-                print(f"    Error: An error occurred while processing '{os.path.basename(img_path)}': {page_e}")
-                print("    This file will be skipped.")
-                # If processing should continue even if an error occurs on a page.
-                # To stop processing, use raise page_e etc.
+        # Embedding means recompressing every image, so build runs of pages in
+        # parallel worker processes and merge the partial PDFs in order.
+        max_workers = _pool_size(len(image_paths))
+        images_per_task = -(-len(image_paths) // (max_workers * 2))
+        parts = [image_paths[start:start + images_per_task]
+                 for start in range(0, len(image_paths), images_per_task)]
+        with ProcessPoolExecutor(max_workers=max_workers) as ex:
+            i = 0
+            for part_paths, (pdf_bytes, errors) in zip(parts, ex.map(_build_pdf_part, parts)):
+                for img_path, page_error in zip(part_paths, errors):
+                    i += 1
+                    page_log.info(f"  - Page {i}: '{os.path.basename(img_path)}'")
+                    if page_error is not None:
+                        log.error(f"    Error: An error occurred while processing '{os.path.basename(img_path)}': {page_error}")
+                        log.error("    This file will be skipped.")
+                        # If processing should continue even if an error occurs on a page.
+                        # To stop processing, raise an exception here instead.
+                if pdf_bytes is not None:
+                    part = fitz.open("pdf", pdf_bytes)
+                    doc.insert_pdf(part)
+                    part.close()
 
         if len(doc) > 0: # Save only if at least one page was processed
             doc.save(output_pdf_path)
             doc.close()
-            print(f"Conversion to PDF completed. Output file: {output_pdf_path}")
+            log.info(f"Conversion to PDF completed. Output file: {output_pdf_path}")
             return True
         else:
-            print("Error: No valid PNG images were found, so the PDF was not created.")
+            log.error("Error: No valid PNG images were found, so the PDF was not created.")
             doc.close()
             return False
 
     except Exception as e:
-        print(f"Error (PNG -> PDF): {e}")
+        log.error(f"Error (PNG -> PDF): {e}")
         # Close doc as it might be open
         try:
             if 'doc' in locals() and doc:
@@ -82,23 +454,51 @@ def convert_png_to_pdf(image_paths, output_pdf_path):
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
+    multiprocessing.freeze_support() # Required for worker processes in PyInstaller builds
+    parser = argparse.ArgumentParser(
+        description="Processes files within the specified <target_folder>.\n"
+                    "  - If exactly one PDF file is found, it's converted to PNGs.\n"
+                    "  - If multiple PNG files are found, they are combined into a single PDF.",
+        epilog="You can also drag and drop a FOLDER onto the executable.\n\n"
+               "Pages are processed in parallel using one worker process per CPU core.\n"
+               "OMP_NUM_THREADS, MKL_NUM_THREADS and OPENBLAS_NUM_THREADS default to 1\n"
+               "so that image libraries don't start competing thread pools.",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("target_folder", help="folder containing the PDF or PNG files")
+    parser.add_argument("--format", choices=["png", "jpg"], default="png", dest="image_format",
+                        help="image format for PDF -> image conversion (default: png). "
+                             "jpg is lossy but much faster to encode; it uses libjpeg-turbo "
+                             "when PyTurboJPEG is installed, otherwise MuPDF's JPEG encoder")
+    parser.add_argument("--quality", type=int, choices=range(1, 101), default=_DEFAULT_JPEG_QUALITY,
+                        metavar="1-100",
+                        help=f"JPEG quality for --format jpg (default: {_DEFAULT_JPEG_QUALITY})")
+    parser.add_argument("--dpi", type=int, default=_DEFAULT_DPI,
+                        help=f"resolution of the images rendered from PDF pages (default: {_DEFAULT_DPI}). "
+                             "Halving the DPI renders and encodes about 4x faster")
+    parser.add_argument("--grayscale", action="store_true",
+                        help="render PDF pages in grayscale (smaller images, faster to encode; "
+                             "good for scanned text)")
+    parser.add_argument("--quiet", action="store_true",
+                        help="don't print a line for every page/file")
+    parser.add_argument("--compress-level", type=int, choices=range(10), default=_DEFAULT_COMPRESS_LEVEL,
+                        metavar="0-9",
+                        help=f"PNG zlib compression level (default: {_DEFAULT_COMPRESS_LEVEL}). "
+                             "Higher values give smaller files but encode much slower")
+    if len(sys.argv) < 2:
         print("--------------------------------------------------")
-        print("Usage:")
-        print(f"  python {os.path.basename(sys.argv[0])} <target_folder>")
-        print("  or drag and drop a FOLDER onto the executable.")
-        print("\nDescription:")
-        print("  Processes files within the specified <target_folder>.")
-        print("  - If exactly one PDF file is found, it's converted to PNGs.")
-        print("  - If multiple PNG files are found, they are combined into a single PDF.")
+        parser.print_help()
         print("--------------------------------------------------")
         # input("Press any key to exit...") # Removed
         sys.exit(1)
+    args = parser.parse_args()
+    _start_logging(args.quiet)
+    if args.dpi <= 0:
+        parser.error("--dpi must be a positive number")
 
-    target_folder = sys.argv[1]
+    target_folder = args.target_folder
 
     if not os.path.isdir(target_folder):
-        print(f"Error: The specified path is not a valid directory: {target_folder}")
+        log.error(f"Error: The specified path is not a valid directory: {target_folder}")
         # input("Press any key to exit...") # Removed
         sys.exit(1)
 
@@ -106,27 +506,34 @@ if __name__ == "__main__":
     output_base_dir = "output"
     try:
         os.makedirs(output_base_dir, exist_ok=True)
-        print(f"Output will be saved to: {os.path.abspath(output_base_dir)}")
+        log.info(f"Output will be saved to: {os.path.abspath(output_base_dir)}")
     except Exception as e:
-        print(f"Error creating output directory '{output_base_dir}': {e}")
+        log.error(f"Error creating output directory '{output_base_dir}': {e}")
         # input("Press any key to exit...") # Removed
         sys.exit(1)
 
+    # (name, path) pairs, so file names are never re-derived from paths later
     pdf_files = []
     png_files = []
-    print(f"Scanning folder: {target_folder}")
+    log.info(f"Scanning folder: {target_folder}")
     try:
-        for filename in os.listdir(target_folder):
-            file_path = os.path.join(target_folder, filename)
-            if os.path.isfile(file_path):
-                _, file_ext = os.path.splitext(filename)
+        # scandir yields the name, the joined path and cached file type together
+        with os.scandir(target_folder) as entries:
+            for entry in entries:
+                # Check the extension first (pure string work) so is_file() only runs
+                # for candidates. A name like ".png" has no extension, as with splitext.
+                base, _, file_ext = entry.name.rpartition(".")
+                if not base:
+                    continue
                 file_ext = file_ext.lower()
-                if file_ext == ".pdf":
-                    pdf_files.append(file_path)
-                elif file_ext == ".png":
-                    png_files.append(file_path)
+                if file_ext == "pdf":
+                    if entry.is_file():
+                        pdf_files.append((entry.name, entry.path))
+                elif file_ext == "png":
+                    if entry.is_file():
+                        png_files.append((entry.name, entry.path))
     except Exception as e:
-        print(f"Error reading directory contents: {e}")
+        log.error(f"Error reading directory contents: {e}")
         # input("Press any key to exit...") # Removed
         sys.exit(1)
 
@@ -138,37 +545,44 @@ if __name__ == "__main__":
     # --- Determine operation mode based on folder content ---
     if num_pdf >= 1 and num_png == 0:
         # --- PDF -> PNG Mode (Process all found PDFs) ---
-        print(f"Mode: PDF -> PNG (Found {num_pdf} PDF files)")
+        log.info(f"Mode: PDF -> PNG (Found {num_pdf} PDF files)")
+        if args.image_format == "jpg":
+            if _get_turbojpeg() is not None:
+                log.info("JPEG encoder: libjpeg-turbo (PyTurboJPEG)")
+            else:
+                log.info("JPEG encoder: MuPDF built-in (install PyTurboJPEG and libjpeg-turbo for faster encoding)")
         processed_something = True
-        for pdf_path in pdf_files:
-            pdf_base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+        for pdf_name, pdf_path in pdf_files:
+            pdf_base_name = os.path.splitext(pdf_name)[0]
             # Output directory inside ./output
-            output_dir = os.path.join(output_base_dir, pdf_base_name + "_png")
-            print(f"\nProcessing '{os.path.basename(pdf_path)}'...")
-            success = convert_pdf_to_png(pdf_path, output_dir)
+            output_dir = os.path.join(output_base_dir, f"{pdf_base_name}_{args.image_format}")
+            log.info(f"\nProcessing '{pdf_name}'...")
+            success = convert_pdf_to_png(pdf_path, output_dir, args.image_format, args.compress_level, args.dpi,
+                                         args.grayscale, args.quality)
             if not success:
                 overall_success = False # Mark failure if any conversion fails
 
     elif num_png > 1 and num_pdf == 0:
         # --- PNG -> PDF Mode ---
-        print(f"Mode: PNG -> PDF (Found {num_png} PNG files)")
+        log.info(f"Mode: PNG -> PDF (Found {num_png} PNG files)")
         processed_something = True
-        image_paths_unsorted = png_files
+        image_files_unsorted = png_files
 
-        # <<< Sort the file path list using natural sort >>>
-        print("Sorting PNG files by name (natural sort)...")
+        # <<< Sort the file list using natural sort on the file names >>>
+        log.info("Sorting PNG files by name (natural sort)...")
         try:
-            image_paths = sorted(image_paths_unsorted, key=natural_sort_key)
-            print("Sorted file order (this will be the PDF page order):")
-            for i, p in enumerate(image_paths):
-                print(f"  {i+1}: {os.path.basename(p)}")
+            image_files = sorted(image_files_unsorted, key=lambda f: natural_sort_key(f[0]))
+            page_log.info("Sorted file order (this will be the PDF page order):")
+            for i, (name, _) in enumerate(image_files):
+                page_log.info(f"  {i+1}: {name}")
         except Exception as sort_e:
-            print(f"Error: An error occurred during file sorting: {sort_e}")
-            print("Continuing without sorting (will use the order provided by the OS).")
-            image_paths = image_paths_unsorted # Use original order on error
+            log.error(f"Error: An error occurred during file sorting: {sort_e}")
+            log.warning("Continuing without sorting (will use the order provided by the OS).")
+            image_files = image_files_unsorted # Use original order on error
+        image_paths = [path for _, path in image_files]
 
         # Determine the output PDF filename based on the first image's name pattern
-        first_image_name = os.path.basename(image_paths[0])
+        first_image_name = image_files[0][0]
         first_image_base, _ = os.path.splitext(first_image_name)
         output_prefix = re.sub(r'[_-]?\\d+$', '', first_image_base)
         if not output_prefix:
@@ -191,30 +605,30 @@ if __name__ == "__main__":
     else:
         # --- Invalid file combination or no files ---
         processed_something = False # No valid operation determined
-        print("Error: Invalid file combination or no processable files found in the target folder.")
+        log.error("Error: Invalid file combination or no processable files found in the target folder.")
         if num_pdf > 0 and num_png > 0:
-            print("  - Found both PDF and PNG files. Please provide a folder with only PDFs or only PNGs.")
-            print(f"    PDF(s): {[os.path.basename(f) for f in pdf_files]}")
-            print(f"    PNG(s): {[os.path.basename(f) for f in png_files]}")
+            log.info("  - Found both PDF and PNG files. Please provide a folder with only PDFs or only PNGs.")
+            log.info(f"    PDF(s): {[name for name, _ in pdf_files]}")
+            log.info(f"    PNG(s): {[name for name, _ in png_files]}")
         elif num_pdf == 0 and num_png == 1:
-            print("  - Found only one PNG file. Need multiple PNGs to combine into a PDF.")
-            print(f"    PNG: {os.path.basename(png_files[0])}")
+            log.info("  - Found only one PNG file. Need multiple PNGs to combine into a PDF.")
+            log.info(f"    PNG: {png_files[0][0]}")
         elif num_pdf == 0 and num_png == 0:
-            print("  - No PDF or PNG files found in the specified folder.")
+            log.info("  - No PDF or PNG files found in the specified folder.")
         # The case num_pdf > 1 and num_png == 0 is now handled above
         overall_success = False # Mark as failure
 
     # Display message based on processing result
-    print("\n--------------------------------------------------")
+    log.info("\n--------------------------------------------------")
     if processed_something:
         if overall_success:
-            print("Processing completed successfully.")
+            log.info("Processing completed successfully.")
         else:
-            print("Processing completed, but some errors occurred.")
+            log.info("Processing completed, but some errors occurred.")
     else:
         # Error message was already printed in the 'else' block above
-        print("No processing was performed due to errors or invalid folder content.")
-    print(f"Check the '{os.path.abspath(output_base_dir)}' directory for results.")
-    print("--------------------------------------------------")
+        log.info("No processing was performed due to errors or invalid folder content.")
+    log.info(f"Check the '{os.path.abspath(output_base_dir)}' directory for results.")
+    log.info("--------------------------------------------------")
 
     # input("Press any key to exit...") # Removed
\ No newline at end of file